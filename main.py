@@ -1,7 +1,10 @@
 import argparse
 import os
 from collections import Counter
-from typing import List
+from functools import cached_property
+from io import StringIO
+from pathlib import Path
+from typing import Iterable, List
 
 import ass
 import questionary
@@ -9,6 +12,9 @@ from ass import Style
 from ass.data import Color
 from questionary import Choice, ValidationError, Validator
 
+HEX_DIGITS = "0123456789abcdefABCDEF"
+YES_NO_CHOICES = [Choice("Yes", value=True), Choice("No", value=False)]
+
 
 def main():
     args = parse_args()
@@ -24,46 +30,49 @@ def main():
 class ASSFile:
     def __init__(self, file_path):
         self.file_path = file_path
-        with open(self.file_path, encoding="utf-8-sig") as f:
-            self.ass_file = ass.parse(f)
-    
-    def get_font_names(self):
-        return [style.fontname for style in self.ass_file.styles]
+        self.ass_file = ass.parse(StringIO(Path(self.file_path).read_text(encoding="utf-8-sig")))
+
+    @cached_property
+    def unique_font_names(self):
+        return frozenset(style.fontname for style in self.ass_file.styles)
 
     def find_styles_by_font(self, font_name):
         return [style for style in self.ass_file.styles if style.fontname == font_name]
 
     def find_most_frequent_font(self):
-        return Counter(self.get_font_names()).most_common(1)[0][0]
+        return Counter(style.fontname for style in self.ass_file.styles).most_common(1)[0][0]
 
-    def replace_style_attributes(self, chosen_styles: List[Style], replacements: dict):
+    def replace_style_attributes(self, chosen_styles: Iterable[Style], replacements: dict):
         """
         Replaces the style attributes for the chosen styles.
 
         Args:
             self (ASSFile): The ASSFile object.
-            chosen_styles (List[Style]): The Styles to be modified.
+            chosen_styles (Iterable[Style]): The Styles to be modified. Only iterated once.
             replacements (dict): The replacements to be made. Key is the index of the attribute to be replaced.
                 Value is the new value to be set. Values can either be a String or a bool.
                 If the value is an empty string, it will be ignored.
         """
-        
-        for replacement_style in chosen_styles:
-            style: Style = next((style for style in self.ass_file.styles if style.name == replacement_style.name), None)
-            if style is None:
-                continue
 
-            for key, value in replacements.items():    
-                if isinstance(value, str) and value.strip() != "":
-                    if key.endswith("color"):
-                        value = StyleModifier.hex_to_ass_color(value)
-                    setattr(style, key, value)
-                elif isinstance(value, bool):
-                    setattr(style, key, value)
+        normalized = []
+        for key, value in replacements.items():
+            if isinstance(value, str) and value.strip() != "":
+                if key.endswith("color"):
+                    value = StyleModifier.hex_to_ass_color(value)
+                normalized.append((key, value))
+            elif isinstance(value, bool):
+                normalized.append((key, value))
+
+        for style in chosen_styles:
+            for key, value in normalized:
+                setattr(style, key, value)
+
+        self.__dict__.pop("unique_font_names", None)
 
-        with open(self.file_path, "w", encoding="utf-8-sig") as f:
-            self.ass_file.dump_file(f)
-            questionary.print(f"✓ Updated .ass file saved to: {self.file_path}", style="bold fg:green")
+        buffer = StringIO()
+        self.ass_file.dump_file(buffer)
+        Path(self.file_path).write_text(buffer.getvalue(), encoding="utf-8-sig")
+        questionary.print(f"✓ Updated .ass file saved to: {self.file_path}", style="bold fg:green")
 
 
 class UserInteraction:
@@ -96,10 +105,10 @@ class UserInteraction:
         
     @staticmethod
     def get_styles_by_font(ass_file: ASSFile, font_name=""):
-        font_names = ass_file.get_font_names()
+        font_names = ass_file.unique_font_names
         font_name = font_name or questionary.autocomplete(
             "Enter the font name:",
-            choices=list(set(font_names)),
+            choices=sorted(font_names),
             validate=lambda font: True if font in font_names else "No styles found.",
         ).unsafe_ask()
         styles = ass_file.find_styles_by_font(font_name)
@@ -115,11 +124,10 @@ class UserInteraction:
     @staticmethod
     def select_style(styles: List[Style]):
         """Allows user to select a specific style or all styles."""
-        choices = ["All styles"] + [style.name for style in styles]
-        selection = questionary.select(
+        choices = [Choice("All styles", value=styles)] + [Choice(style.name, value=[style]) for style in styles]
+        return questionary.select(
             "Multiple styles found. Choose one:", choices=choices
         ).unsafe_ask()
-        return styles if selection == "All styles" else [style for style in styles if style.fontname == selection]
 
     @staticmethod
     def replace_style_attributes_prompt(ass_file: ASSFile, chosen_styles, args):
@@ -132,33 +140,47 @@ class UserInteraction:
 
 
 class StyleModifier:
+    # Style attribute -> (CLI argument, checkbox title, prompt for the new value)
+    FIELDS = {
+        "fontname": ("font_name", "Font name", lambda: questionary.text("New font name:")),
+        "fontsize": ("font_size", "Font size", lambda: questionary.text("New font size:")),
+        "primary_color": ("color", "Primary color", lambda: questionary.text("New primary hex color:", validate=HexCodeValidator)),
+        "secondary_color": ("secondary_color", "Secondary color", lambda: questionary.text("New secondary hex color:", validate=HexCodeValidator)),
+        "outline_color": ("outline_color", "Outline color", lambda: questionary.text("New outline hex color:", validate=HexCodeValidator)),
+        "back_color": ("back_color", "Back color", lambda: questionary.text("New back hex color:", validate=HexCodeValidator)),
+        "bold": ("bold", "Bold", lambda: questionary.select("Make text bold?", choices=YES_NO_CHOICES)),
+        "italic": ("italic", "Italic", lambda: questionary.select("Make text italic?", choices=YES_NO_CHOICES)),
+        "underline": ("underline", "Underline", lambda: questionary.select("Underline text?", choices=YES_NO_CHOICES)),
+        "strikeout": ("strikeout", "Strikeout", lambda: questionary.select("Strikeout text?", choices=YES_NO_CHOICES)),
+        "outline": ("outline_thickness", "Outline thickness", lambda: questionary.text("Outline thickness:")),
+        "shadow": ("shadow_distance", "Shadow distance", lambda: questionary.text("Shadow distance:")),
+    }
+
     @staticmethod
     def get_replacements(replace_type, args):
         if replace_type == "font_name":
             return {"fontname": args.font_name or questionary.text("Enter the new font name:").unsafe_ask()}
 
-        return {
-            "fontname": args.font_name or questionary.text("New font name (enter to skip):", default="").unsafe_ask(),
-            "fontsize": args.font_size or questionary.text("New font size (enter to skip):", default="").unsafe_ask(),
-            "primary_color": args.color or questionary.text("New primary hex color (enter to skip):", validate=HexCodeValidator, default="").unsafe_ask(),
-            "secondary_color": args.secondary_color or questionary.text("New secondary hex color (enter to skip):", validate=HexCodeValidator, default="").unsafe_ask(),
-            "outline_color": args.outline_color or questionary.text("New outline hex color (enter to skip):", validate=HexCodeValidator, default="").unsafe_ask(),
-            "back_color": args.back_color or questionary.text("New back hex color (enter to skip):", validate=HexCodeValidator, default="").unsafe_ask(),
-            "bold": args.bold or questionary.select("Make text bold?", choices=[Choice("Yes", value=True), Choice("No", value=False), Choice("Skip", value="")]).unsafe_ask(),
-            "italic": args.italic or questionary.select("Make text italic?", choices=[Choice("Yes", value=True), Choice("No", value=False), Choice("Skip", value="")]).unsafe_ask(),
-            "underline": args.underline or questionary.select("Underline text?", choices=[Choice("Yes", value=True), Choice("No", value=False), Choice("Skip", value="")]).unsafe_ask(),
-            "strikeout": args.strikeout or questionary.select("Strikeout text?", choices=[Choice("Yes", value=True), Choice("No", value=False), Choice("Skip", value="")]).unsafe_ask(),
-            "outline": args.outline_thickness or questionary.text("Outline thickness (enter to skip):", default="").unsafe_ask(),
-            "shadow": args.shadow_distance or questionary.text("Shadow distance (enter to skip):", default="").unsafe_ask()
-        }
+        replacements = {key: getattr(args, arg) for key, (arg, _, _) in StyleModifier.FIELDS.items()}
+        missing = [key for key, value in replacements.items() if value is None]
+        if not missing:
+            return replacements
+
+        selected = questionary.checkbox(
+            "Which attributes would you like to modify?",
+            choices=[Choice(StyleModifier.FIELDS[key][1], value=key) for key in missing],
+        ).unsafe_ask()
+        for key in missing:
+            replacements[key] = StyleModifier.FIELDS[key][2]().unsafe_ask() if key in selected else ""
+        return replacements
 
     @staticmethod
     def hex_to_ass_color(hex_color):
         hex_color = hex_color.lstrip("#")
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
-        return Color(r, g, b, 255)
+        if len(hex_color) != 6 or hex_color.strip(HEX_DIGITS):
+            raise ValueError(f"Invalid hex color code: {hex_color}")
+        value = int(hex_color, 16)
+        return Color(value >> 16 & 0xFF, value >> 8 & 0xFF, value & 0xFF, 255)
 
 
 class HexCodeValidator(Validator):
@@ -166,7 +188,7 @@ class HexCodeValidator(Validator):
         if not document.text:
             return True
         hex_code = document.text.lstrip("#")
-        if len(hex_code) != 6 or not all(c in "0123456789abcdefABCDEF" for c in hex_code):
+        if len(hex_code) != 6 or hex_code.strip(HEX_DIGITS):
             raise ValidationError(message="Invalid hex color code.", cursor_position=len(document.text))
 
 
@@ -191,23 +213,29 @@ def parse_args():
         else:
             raise argparse.ArgumentTypeError('Boolean value expected.')
 
+    def hex_color(value):
+        hex_code = value.lstrip("#")
+        if value and (len(hex_code) != 6 or hex_code.strip(HEX_DIGITS)):
+            raise argparse.ArgumentTypeError('Hex color code expected.')
+        return value
+
     parser = argparse.ArgumentParser(description="Modify .ass subtitle styles via CLI or interactive prompts.")
     parser.add_argument("file_path", nargs="?", help="Path to the .ass file.")
     parser.add_argument("--search-type", choices=["font_name", "most_frequent", "all_styles"], help="Method to search for styles.")
     parser.add_argument("--search-font", help="Font name to search for (if using 'font_name' search type).")
     parser.add_argument("--replace-type", choices=["font_name", "everything"], help="What to replace in styles.")
-    parser.add_argument("--font-name", default="", help="New font name.")
-    parser.add_argument("--font-size", default="", help="New font size.")
-    parser.add_argument("--color", default="", help="New primary hex color code.")
-    parser.add_argument("--secondary-color", default="", help="New secondary hex color code.")
-    parser.add_argument("--outline-color", default="", help="New outline hex color code.")
-    parser.add_argument("--back-color", default="", help="New back hex color code.")
-    parser.add_argument("--bold", default="", type=str_to_bool, nargs='?', const=True, help="Make text bold.")
-    parser.add_argument("--italic", default="", type=str_to_bool, nargs='?', const=True, help="Make text italic.")
-    parser.add_argument("--underline", default="", type=str_to_bool, nargs='?', const=True, help="Underline text.")
-    parser.add_argument("--strikeout", default="", type=str_to_bool, nargs='?', const=True, help="Strikeout text.")
-    parser.add_argument("--outline-thickness", default="", help="New outline thickness.")
-    parser.add_argument("--shadow-distance", default="", help="New shadow distance.")
+    parser.add_argument("--font-name", help="New font name.")
+    parser.add_argument("--font-size", help="New font size.")
+    parser.add_argument("--color", type=hex_color, help="New primary hex color code.")
+    parser.add_argument("--secondary-color", type=hex_color, help="New secondary hex color code.")
+    parser.add_argument("--outline-color", type=hex_color, help="New outline hex color code.")
+    parser.add_argument("--back-color", type=hex_color, help="New back hex color code.")
+    parser.add_argument("--bold", type=str_to_bool, nargs='?', const=True, help="Make text bold.")
+    parser.add_argument("--italic", type=str_to_bool, nargs='?', const=True, help="Make text italic.")
+    parser.add_argument("--underline", type=str_to_bool, nargs='?', const=True, help="Underline text.")
+    parser.add_argument("--strikeout", type=str_to_bool, nargs='?', const=True, help="Strikeout text.")
+    parser.add_argument("--outline-thickness", help="New outline thickness.")
+    parser.add_argument("--shadow-distance", help="New shadow distance.")
     return parser.parse_args()
 
 